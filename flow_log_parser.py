@@ -1,9 +1,175 @@
 import csv
-from collections import defaultdict
-from typing import Dict, List, Tuple
+import hashlib
+import mmap
+from collections import Counter
+import pickle
+import re
+from typing import Dict, List, Optional, Tuple
 import sys
 import os
 
+# Optional JIT fast path: when NumPy and Numba are installed the flow log
+# scan runs as compiled code (see _scan_kernel). The pure-Python scanner
+# is always available as a fallback.
+try:
+    import numpy as np
+    from numba import njit, prange
+except ImportError:
+    np = None
+    njit = None
+
+# Optional C-level CSV parser for loading large lookup tables
+try:
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa_csv = None
+
+# Small ids for the protocols the dense lookup tables can encode.
+# Alphabetical so row-major iteration of the dense counters yields
+# combos already in final (port, protocol) output order.
+_PROTO_IDS = {'icmp': 0, 'tcp': 1, 'udp': 2}
+_PROTO_NAMES = ('icmp', 'tcp', 'udp')
+
+# One-scan acceptor for a well-formed v2 line: validates the version and
+# the 14-field minimum and captures dstport and protocol in a single
+# C-level match instead of a split plus several Python checks
+_LINE_RE = re.compile(r'^\s*2\s+(?:\S+\s+){5}(\d{1,5})\s+(\S+)(?:\s+\S+){6,}\s*$')
+
+# Bulk byte-level counterparts used by the scanner: one findall per chunk
+# captures dstport and protocol from every well-formed line. The trusted
+# variant drops the version and field-count constraints but must still
+# consume each line to its end - _scan_span_exact treats the bytes
+# between matches as unparsed lines, so a mid-line match would feed the
+# tail of an already-counted record back through the gap handler.
+_SCAN_RE = re.compile(rb'^2 (?:\S+ ){5}(\d{1,5}) (\d{1,3})(?: \S+){6,}\r?$', re.M)
+_SCAN_RE_TRUSTED = re.compile(rb'^(?:\S+ ){6}(\d{1,5}) (\d{1,3})(?: \S+)*\r?$', re.M)
+
+# Chunk size for the bulk scan: large enough to amortize the C-level
+# pass, small enough to bound the per-chunk match list
+_SCAN_CHUNK = 1 << 24
+
+if njit is not None:
+    @njit(cache=True)
+    def _scan_range(buf, start, end, combo_out, tag_out, port_proto_to_tag):
+        """
+        Compiled counting loop over buf[start:end] (a uint8 view).
+
+        Walks the range once, tracking the field index by counting
+        spaces and accumulating dstport/protocol digit by digit.
+        Protocols are reduced to small ids (icmp=0, tcp=1, udp=2);
+        counts land in combo_out[port, proto_id] and
+        tag_out[port_proto_to_tag[port, proto_id]].
+
+        Returns (invalid, other). invalid counts clean short lines,
+        which the strict parser also rejects (this loop hard-codes the
+        strict rules; trusted runs never reach it). other counts lines this
+        loop cannot judge - protocols outside tcp/udp/icmp, but also
+        any layout the space-counting walk does not model: tabs,
+        leading/doubled/trailing spaces, a stray CR, a non-digit or
+        overlong run in the port or protocol field, or a version
+        mismatch on an otherwise field-rich line. str.split()
+        collapses arbitrary whitespace, so such lines may still be
+        valid (or misalign the field index); the caller must rerun
+        the exact scan whenever other > 0 rather than guess here.
+        """
+        n = end
+        invalid = 0
+        other = 0
+        i = start
+        while i < n:
+            line_start = i
+            field = 0
+            port = 0
+            port_digits = 0
+            proto = 0
+            proto_digits = 0
+            odd = False
+            prev_space = True   # a space at line start is an anomaly
+            while i < n and buf[i] != 10:               # '\n'
+                c = buf[i]
+                if c == 13:                             # '\r'
+                    # CR is only regular immediately before the LF;
+                    # leave prev_space untouched so "space CR LF"
+                    # still registers as a trailing space
+                    if i + 1 >= n or buf[i + 1] != 10:
+                        odd = True
+                elif c == 32:                           # ' '
+                    if prev_space:
+                        odd = True
+                    prev_space = True
+                    field += 1
+                else:
+                    prev_space = False
+                    if c == 9 or c == 11 or c == 12:    # tab/VT/FF
+                        odd = True
+                    elif field == 6:
+                        if 48 <= c <= 57:               # '0'..'9'
+                            port = port * 10 + (c - 48)
+                            port_digits += 1
+                        else:
+                            odd = True
+                    elif field == 7:
+                        if 48 <= c <= 57:
+                            proto = proto * 10 + (c - 48)
+                            proto_digits += 1
+                        else:
+                            odd = True
+                i += 1
+            if prev_space:      # empty line, or space right before LF
+                odd = True
+            # Mirror the \d{1,5} / \d{1,3} caps of the scan regexes: an
+            # overlong digit run would wrap the int64 accumulator and
+            # count under an arbitrary (possibly negative) port index
+            if port_digits > 5 or proto_digits > 3:
+                odd = True
+            i += 1
+            if odd or (field >= 13
+                       and (port_digits == 0 or proto_digits == 0
+                            or buf[line_start] != 50                # '2'
+                            or buf[line_start + 1] != 32)):
+                other += 1
+                continue
+            if field < 13 or port > 65535:
+                invalid += 1
+                continue
+            if proto == 6:
+                pid = 1                                 # tcp
+            elif proto == 17:
+                pid = 2                                 # udp
+            elif proto == 1:
+                pid = 0                                 # icmp
+            else:
+                other += 1
+                continue
+            combo_out[port, pid] += 1
+            tag_out[port_proto_to_tag[port, pid]] += 1
+        return invalid, other
+
+    @njit(parallel=True, cache=True)
+    def _scan_parallel(buf, bounds, combo_locals, tag_locals, port_proto_to_tag):
+        """
+        Run _scan_range over newline-aligned chunks in parallel.
+
+        bounds[t]:bounds[t+1] delimits chunk t; each thread fills its
+        own combo_locals[t]/tag_locals[t] slice, so there is no shared
+        write traffic until the caller sums over the thread axis.
+        """
+        invalid = 0
+        other = 0
+        for t in prange(bounds.size - 1):
+            inv, oth = _scan_range(buf, bounds[t], bounds[t + 1],
+                                   combo_locals[t], tag_locals[t],
+                                   port_proto_to_tag)
+            invalid += inv
+            other += oth
+        return invalid, other
+
+
+# Files below this size are scanned on one thread; chunking overhead
+# would outweigh the parallel win
+_PARALLEL_THRESHOLD = 4 * 1024 * 1024
+
+
 class FlowLogAnalyzer:
     # Default protocol mapping based on IANA protocol numbers
     DEFAULT_PROTOCOL_MAP = {
@@ -15,12 +181,28 @@ class FlowLogAnalyzer:
     # Minimum number of fields required in a valid flow log line
     MIN_FIELDS = 14
 
-    def __init__(self, lookup_file: str, flow_log_file: str, output_file: str):
+    def __init__(self, lookup_file: str, flow_log_file: str, output_file: str,
+                 trusted: bool = False, max_size_mb: Optional[int] = None):
         self.lookup_file = lookup_file
         self.flow_log_file = flow_log_file
         self.output_file = output_file
+        # Trusted mode skips per-line validation (version marker, field
+        # count) for repeated runs over sources known to be well-formed
+        self.trusted = trusted
+        # Optional size cap for callers that want to reject oversized
+        # inputs up front; the scan itself streams at constant memory
+        self.max_size_mb = max_size_mb
+        self._parse_line = (self._parse_flow_log_line_fast if trusted
+                            else self._parse_flow_log_line)
         self.tag_mappings = {}
         self.protocol_map = self._load_protocol_mappings()
+        # Bytes-keyed mirror of the protocol map so the byte scanner can
+        # resolve a raw protocol field to (proto_id, name) without
+        # decoding each line to str first
+        self._proto_info_bytes = {
+            key.encode('ascii'): (_PROTO_IDS.get(value), value)
+            for key, value in self.protocol_map.items()
+        }
         self._load_lookup_file()
 
     def _load_protocol_mappings(self) -> Dict[str, str]:
@@ -45,20 +227,128 @@ class FlowLogAnalyzer:
                 return self.DEFAULT_PROTOCOL_MAP
         return self.DEFAULT_PROTOCOL_MAP
 
+    def _lookup_cache_path(self) -> Optional[str]:
+        """
+        Cache file path for the parsed lookup table, or None if the
+        lookup file cannot be stat'ed.
+
+        The key covers the lookup file's path, mtime and size - so edits
+        invalidate it automatically - plus the protocol mappings file,
+        since normalization feeds into the parsed result.
+        """
+        try:
+            st = os.stat(self.lookup_file)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(self.lookup_file)}|{st.st_mtime_ns}|{st.st_size}"
+        try:
+            pst = os.stat('protocol_mappings.csv')
+            key += f"|{pst.st_mtime_ns}|{pst.st_size}"
+        except OSError:
+            key += "|default"
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        cache_home = (os.environ.get('XDG_CACHE_HOME')
+                      or os.path.join(os.path.expanduser('~'), '.cache'))
+        return os.path.join(cache_home, 'flow_log_parser', f"{digest}.pickle")
+
     def _load_lookup_file(self) -> None:
         """Load and parse the port/protocol to tag lookup file."""
+        # Warm runs over the same lookup table skip the CSV parse
+        # entirely; cache problems fall through to a normal load
+        cache_path = self._lookup_cache_path()
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'rb') as f:
+                    self.tag_mappings = pickle.load(f)
+                self._build_dense_tables()
+                return
+            except FileNotFoundError:
+                pass
+            except Exception:
+                # Unpickling arbitrary garbage can raise almost anything
+                # (ValueError, AttributeError, ...), not just
+                # PickleError; a bad cache must never block a run, so
+                # drop it and reparse from the CSV
+                self.tag_mappings = {}
+                try:
+                    os.remove(cache_path)
+                except OSError:
+                    pass
         try:
-            with open(self.lookup_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    port = int(row['dstport'])
-                    protocol = self._normalize_protocol(row['protocol'])
-                    tag = row['tag']
-                    self.tag_mappings[(port, protocol)] = tag
+            if pa_csv is not None:
+                # pyarrow parses and type-converts the whole file in C;
+                # only the (small) per-row dict insert stays in Python
+                table = pa_csv.read_csv(self.lookup_file)
+                for port, protocol, tag in zip(
+                        table.column('dstport').to_pylist(),
+                        table.column('protocol').to_pylist(),
+                        table.column('tag').to_pylist()):
+                    protocol = self._normalize_protocol(str(protocol))
+                    self.tag_mappings[(int(port), protocol)] = str(tag)
+            else:
+                with open(self.lookup_file, 'r') as f:
+                    reader = csv.DictReader(f)
+                    for row in reader:
+                        port = int(row['dstport'])
+                        protocol = self._normalize_protocol(row['protocol'])
+                        tag = row['tag']
+                        self.tag_mappings[(port, protocol)] = tag
         except FileNotFoundError:
             raise Exception(f"Lookup file not found: {self.lookup_file}")
         except ValueError as e:
             raise Exception(f"Invalid data in lookup file: {str(e)}")
+        if cache_path is not None:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(self.tag_mappings, f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+        self._build_dense_tables()
+
+    def _build_dense_tables(self) -> None:
+        """
+        Precompute dense (port, protocol) lookup tables.
+
+        Tags are interned to small integer ids (0 is Untagged) so the
+        scan never hashes a tag string; _id_to_tag translates back at
+        reduction time. _slot_tag is a flat list mapping slot
+        (port << 2 | proto_id) straight to a tag id, so the hot scan
+        replaces a tuple-keyed dict lookup with a single list index.
+        _port_proto_to_tag is the int32[65536, 4] equivalent consumed by
+        the compiled kernel. The dense tables are left as None when the
+        lookup table uses a protocol outside tcp/udp/icmp;
+        _tag_id_mappings covers that dict-based fallback.
+        """
+        self._slot_tag = None
+        self._port_proto_to_tag = None
+        slot_tag = [0] * (65536 << 2)
+        table = np.zeros((65536, 4), dtype=np.int32) if np is not None else None
+        id_to_tag = ['Untagged']
+        tag_ids = {'Untagged': 0}
+        tag_id_mappings = {}
+        dense_ok = True
+        for (port, protocol), tag in self.tag_mappings.items():
+            tid = tag_ids.get(tag)
+            if tid is None:
+                tid = len(id_to_tag)
+                tag_ids[tag] = tid
+                id_to_tag.append(tag)
+            tag_id_mappings[(port, protocol)] = tid
+            pid = _PROTO_IDS.get(protocol)
+            if pid is None or not 0 <= port <= 65535:
+                dense_ok = False
+                continue
+            slot_tag[(port << 2) | pid] = tid
+            if table is not None:
+                table[port, pid] = tid
+        self._id_to_tag = id_to_tag
+        self._tag_id_mappings = tag_id_mappings
+        if dense_ok:
+            self._slot_tag = slot_tag
+            self._port_proto_to_tag = table
 
     def _normalize_protocol(self, protocol: str) -> str:
         """
@@ -80,10 +370,26 @@ class FlowLogAnalyzer:
         Raises:
             ValueError: If line format is invalid or missing required fields
         """
-        fields = line.strip().split()
-        
-        if len(fields) < self.MIN_FIELDS:
-            raise ValueError(f"Line has insufficient fields: {len(fields)}, minimum required: {self.MIN_FIELDS}")
+        match = _LINE_RE.match(line)
+        if match is not None:
+            dst_port = int(match.group(1))
+            protocol = match.group(2)
+            if dst_port <= 65535 and (protocol.isdigit()
+                                      or protocol.lower() in self.DEFAULT_PROTOCOL_MAP):
+                # Flow logs emit protocols in canonical form (numeric),
+                # so a direct map hit skips the .lower() round trip;
+                # _normalize_protocol stays for the odd mixed-case name
+                return dst_port, (self.protocol_map.get(protocol)
+                                  or self._normalize_protocol(protocol))
+        # Rejected lines re-run the field-by-field checks below so the
+        # error message pinpoints what was wrong. maxsplit=8 stops
+        # splitting after the protocol field (splitting on None already
+        # ignores surrounding whitespace); fields 8-13 stay one slice
+        # whose token count is checked without materializing them
+        fields = line.split(None, 8)
+
+        if len(fields) < 9 or len(fields[8].split()) < self.MIN_FIELDS - 8:
+            raise ValueError(f"Line has insufficient fields: {len(line.split())}, minimum required: {self.MIN_FIELDS}")
 
         # Validating the version  
         if fields[0] != '2':
@@ -104,6 +410,21 @@ class FlowLogAnalyzer:
         except ValueError as e:
             raise ValueError(f"Invalid field value: {str(e)}")
 
+    def _parse_flow_log_line_fast(self, line: str) -> Tuple[int, str]:
+        """
+        Parse a flow log line without validation (trusted mode).
+
+        Splits only as far as the protocol field and trusts the source
+        to emit well-formed version 2 records; int() still rejects
+        outright garbage in the port field.
+        """
+        fields = line.split(None, 8)
+        if len(fields) < 8:
+            raise ValueError(f"Invalid flow log line format: {line}")
+        protocol = fields[7]
+        return int(fields[6]), (self.protocol_map.get(protocol)
+                                or self._normalize_protocol(protocol))
+
     def analyze_logs(self) -> Tuple[Dict[str, int], Dict[Tuple[int, str], int]]:
         """
         Analyze flow logs and generate statistics.
@@ -112,49 +433,247 @@ class FlowLogAnalyzer:
             Tag counts and port/protocol combination counts
         """
 
-        MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-    
-        # Verifying the file size
-        file_size = os.path.getsize(self.flow_log_file)
-        if file_size > MAX_FILE_SIZE:
-            raise Exception(f"Flow log file exceeds maximum allowed size of 10MB (current size: {file_size/1024/1024:.2f}MB)")
-        
-        tag_counts = defaultdict(int)
-        combo_counts = defaultdict(int)
-        
+        if self.max_size_mb is not None:
+            file_size = os.path.getsize(self.flow_log_file)
+            if file_size > self.max_size_mb * 1024 * 1024:
+                raise Exception(f"Flow log file exceeds maximum allowed size of {self.max_size_mb}MB (current size: {file_size/1024/1024:.2f}MB)")
+
+        tag_counts = Counter()
+        combo_counts = Counter()
+
         try:
-            with open(self.flow_log_file, 'r') as f:
-                for line in f:
-                    try:
-                        dst_port, protocol = self._parse_flow_log_line(line)
-                        combo_counts[(dst_port, protocol)] += 1
-                        tag = self.tag_mappings.get((dst_port, protocol), 'Untagged')
-                        tag_counts[tag] += 1
-                    except ValueError as e:
-                        print(f"Warning: Skipping invalid line: {str(e)}", file=sys.stderr)
-                        continue
-
-            # print("Tag Counts:", tag_counts, "combocounts:", combo_counts)            
+            with open(self.flow_log_file, 'rb') as f:
+                try:
+                    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    # Empty or non-regular file (e.g. a pipe): read it in
+                    # large binary chunks instead
+                    self._scan_stream(f, tag_counts, combo_counts)
+                else:
+                    with buf:
+                        if not self._scan_buffer_fast(buf, tag_counts, combo_counts):
+                            self._scan_buffer(buf, tag_counts, combo_counts)
+
+            # print("Tag Counts:", tag_counts, "combocounts:", combo_counts)
             return dict(tag_counts), dict(combo_counts)
-            
+
         except FileNotFoundError:
             raise Exception(f"Flow log file not found: {self.flow_log_file}")
 
+    def _scan_stream(self, f, tag_counts: Dict[str, int],
+                     combo_counts: Dict[Tuple[int, str], int]) -> None:
+        """
+        Count flow log lines from a file that cannot be memory-mapped.
+
+        Reads 1MB binary blocks with os.read - no per-line str decode or
+        allocation - and hands each whole-line span to _scan_buffer,
+        carrying any partial trailing line over to the next block.
+        """
+        fd = f.fileno()
+        read = os.read
+        scan = self._scan_buffer
+        tail = b''
+        while True:
+            chunk = read(fd, 1 << 20)
+            if not chunk:
+                break
+            if tail:
+                chunk = tail + chunk
+            cut = chunk.rfind(b'\n')
+            if cut == -1:
+                tail = chunk
+                continue
+            scan(chunk[:cut + 1], tag_counts, combo_counts)
+            tail = chunk[cut + 1:]
+        if tail:
+            scan(tail, tag_counts, combo_counts)
+
+    def _scan_buffer_fast(self, buf, tag_counts: Dict[str, int],
+                          combo_counts: Dict[Tuple[int, str], int]) -> bool:
+        """
+        Run the Numba-compiled scan if available.
+
+        Returns True when the buffer was fully counted, False when the
+        caller should fall back to the pure-Python scanner (Numba or the
+        dense tables are missing, the run is trusted, or the kernel
+        reported lines it cannot judge - protocols outside tcp/udp/icmp
+        or any whitespace layout the compiled walk does not model).
+        """
+        # The kernel hard-codes the strict rules (version marker, >= 14
+        # fields); a trusted run accepts lines the kernel would drop, so
+        # results would depend on whether Numba happens to be installed.
+        # Trusted runs stay on the bulk-regex scanner instead.
+        if self.trusted or njit is None or self._port_proto_to_tag is None:
+            return False
+        data = np.frombuffer(buf, dtype=np.uint8)
+        nthreads = min(os.cpu_count() or 1, 16)
+        if nthreads > 1 and data.size >= _PARALLEL_THRESHOLD:
+            # Split at rough equal offsets, then advance each cut to the
+            # byte after the next newline so no line straddles chunks
+            bounds = [0]
+            for t in range(1, nthreads):
+                cut = buf.find(b'\n', data.size * t // nthreads)
+                bounds.append(data.size if cut == -1 else cut + 1)
+            bounds.append(data.size)
+            bounds = np.array(sorted(set(bounds)), dtype=np.int64)
+            nchunks = bounds.size - 1
+            combo_locals = np.zeros((nchunks, 65536, 4), dtype=np.int64)
+            tag_locals = np.zeros((nchunks, len(self._id_to_tag)), dtype=np.int64)
+            invalid, other = _scan_parallel(data, bounds, combo_locals,
+                                            tag_locals, self._port_proto_to_tag)
+            combo_out = combo_locals.sum(axis=0)
+            tag_out = tag_locals.sum(axis=0)
+        else:
+            combo_out = np.zeros((65536, 4), dtype=np.int64)
+            tag_out = np.zeros(len(self._id_to_tag), dtype=np.int64)
+            invalid, other = _scan_range(data, 0, data.size, combo_out,
+                                         tag_out, self._port_proto_to_tag)
+        if other:
+            return False
+        if invalid:
+            print(f"Warning: Skipped {invalid} invalid lines", file=sys.stderr)
+        # np.nonzero walks the array row-major, so with alphabetical
+        # proto ids the combos come out already in output order and the
+        # sort in write_results reduces to a linear verification pass
+        ports, pids = np.nonzero(combo_out)
+        for port, pid in zip(ports.tolist(), pids.tolist()):
+            combo_counts[(port, _PROTO_NAMES[pid])] = int(combo_out[port, pid])
+        for tid, count in enumerate(tag_out.tolist()):
+            if count:
+                tag_counts[self._id_to_tag[tid]] = count
+        return True
+
+    def _scan_buffer(self, buf, tag_counts: Dict[str, int],
+                     combo_counts: Dict[Tuple[int, str], int]) -> None:
+        """
+        Scan a flow log buffer (mmap or bytes) and accumulate counts.
+
+        Runs one C-level findall per newline-aligned chunk, so no
+        per-line Python bytecode executes for a well-formed log; the
+        captured (dstport, protocol) byte pairs are counted by Counter's
+        C loop and resolved to ports/tags once per distinct pair. A
+        chunk whose match count falls short of its line count contains
+        irregular lines and is rescanned with the spans exposed, routing
+        just those lines through the validating parser.
+        """
+        pattern = _SCAN_RE_TRUSTED if self.trusted else _SCAN_RE
+        size = len(buf)
+        pos = 0
+        while pos < size:
+            if size - pos <= _SCAN_CHUNK:
+                end = size
+            else:
+                cut = buf.find(b'\n', pos + _SCAN_CHUNK)
+                end = size if cut == -1 else cut + 1
+            pairs = pattern.findall(buf, pos, end)
+            span = buf[pos:end]
+            lines = span.count(b'\n')
+            if not span.endswith(b'\n'):
+                lines += 1
+            if len(pairs) == lines:
+                self._resolve_pairs(Counter(pairs), tag_counts, combo_counts)
+            else:
+                self._scan_span_exact(buf, pos, end, pattern,
+                                      tag_counts, combo_counts)
+            pos = end
+
+    def _scan_span_exact(self, buf, pos: int, end: int, pattern,
+                         tag_counts: Dict[str, int],
+                         combo_counts: Dict[Tuple[int, str], int]) -> None:
+        """
+        Rescan a chunk that contains lines the bulk pattern rejected.
+
+        Matching lines are counted exactly as in the bulk path; the gaps
+        between matches - blank, malformed, or merely non-canonical
+        lines (textual protocols, extra whitespace) - go through the
+        per-line validating parser, which recovers or warns and skips.
+        """
+        pairs = []
+        append = pairs.append
+        prev = pos
+        for match in pattern.finditer(buf, pos, end):
+            start, stop = match.span()
+            if start > prev:
+                self._scan_gap(buf[prev:start], tag_counts, combo_counts)
+            append(match.group(1, 2))
+            prev = stop + 1                     # skip the newline
+        if prev < end:
+            self._scan_gap(buf[prev:end], tag_counts, combo_counts)
+        self._resolve_pairs(Counter(pairs), tag_counts, combo_counts)
+
+    def _scan_gap(self, chunk: bytes, tag_counts: Dict[str, int],
+                  combo_counts: Dict[Tuple[int, str], int]) -> None:
+        """Count or report each line in a non-matching stretch."""
+        parse_line = self._parse_line
+        tagid_get = self._tag_id_mappings.get
+        id_to_tag = self._id_to_tag
+        lines = chunk.split(b'\n')
+        if lines and lines[-1] == b'':          # trailing-newline artifact
+            lines.pop()
+        for raw in lines:
+            try:
+                parsed = parse_line(raw.decode('utf-8', 'replace'))
+            except ValueError as e:
+                print(f"Warning: Skipping invalid line: {str(e)}", file=sys.stderr)
+                continue
+            combo_counts[parsed] = combo_counts.get(parsed, 0) + 1
+            tag = id_to_tag[tagid_get(parsed, 0)]
+            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+
+    def _resolve_pairs(self, pair_counts, tag_counts: Dict[str, int],
+                       combo_counts: Dict[Tuple[int, str], int]) -> None:
+        """
+        Translate counted (dstport, protocol) byte pairs into the result
+        mappings; int conversion and tag resolution run once per
+        distinct pair rather than once per line.
+        """
+        proto_get = self._proto_info_bytes.get
+        tagid_get = self._tag_id_mappings.get
+        slot_tag = self._slot_tag
+        id_to_tag = self._id_to_tag
+        combo_get = combo_counts.get
+        tag_get = tag_counts.get
+        for (port_bytes, proto_bytes), count in pair_counts.items():
+            port = int(port_bytes)
+            if port > 65535:
+                message = (f"Warning: Skipping invalid line: Invalid field "
+                           f"value: Invalid destination port number: {port}")
+                for _ in range(count):
+                    print(message, file=sys.stderr)
+                continue
+            info = proto_get(proto_bytes)
+            if info is not None:
+                pid, protocol = info
+            else:
+                pid, protocol = None, proto_bytes.decode('ascii')
+            key = (port, protocol)
+            if pid is not None and slot_tag is not None:
+                tid = slot_tag[(port << 2) | pid]
+            else:
+                tid = tagid_get(key, 0)
+            combo_counts[key] = combo_get(key, 0) + count
+            tag = id_to_tag[tid]
+            tag_counts[tag] = tag_get(tag, 0) + count
+
     def write_results(self, tag_counts: Dict[str, int], 
                      combo_counts: Dict[Tuple[int, str], int]) -> None:
         """Write analysis report for Tag count and Protocol Combination Counr"""
+        # Preformat the whole report and flush it in one write call
+        # instead of crossing into the I/O layer once per row
+        lines = ["Tag Counts:\n", "Tag,Count\n"]
+        lines.extend(f"{tag},{count}\n"
+                     for tag, count in sorted(tag_counts.items()))
+        lines.append("\nPort/Protocol Combination Counts:\n")
+        lines.append("Port,Protocol,Count\n")
+        lines.extend(f"{port},{protocol},{count}\n"
+                     for (port, protocol), count in sorted(combo_counts.items()))
+
         try:
-            with open(self.output_file, 'w', newline='') as f:
-                f.write("Tag Counts:\n")
-                f.write("Tag,Count\n")
-                for tag, count in sorted(tag_counts.items()):
-                    f.write(f"{tag},{count}\n")
-                
-                f.write("\nPort/Protocol Combination Counts:\n")
-                f.write("Port,Protocol,Count\n")
-                for (port, protocol), count in sorted(combo_counts.items()):
-                    f.write(f"{port},{protocol},{count}\n")
-                    
+            # Binary mode with a 1MB buffer: one encode and (for typical
+            # reports) one write(2) instead of the TextIOWrapper
+            # encode-per-write path flushing every 8KB
+            with open(self.output_file, 'wb', buffering=1 << 20) as f:
+                f.write("".join(lines).encode('utf-8'))
         except IOError as e:
             raise Exception(f"Error writing to output file: {str(e)}")
 
@@ -67,44 +67,63 @@ class FlowLogGenerator:
             output_file: Output file path
         """
         print(f"Generating flow log of minimum {min_size_mb}MB...")
-        start_time = time.time()
+        wall_start = time.time()
         min_size_bytes = min_size_mb * 1024 * 1024
-        
-        account_id = "123456789012"
+
+        batch_size = 50000
         bytes_written = 0
         lines_written = 0
-        
+
         with open(output_file, 'w') as f:
             while bytes_written < min_size_bytes:
-                # Generate random flow log entry
-                eni = self.generate_random_eni()
-                src_ip = self.generate_random_ip()
-                dst_ip = self.generate_random_ip()
-                src_port = random.choice(self.all_ports)
-                dst_port = random.randint(1024, 65535)
-                protocol = random.choice(self.protocols)
-                packets = random.randint(1, 1000)
-                bytes_count = random.randint(64, 1500)
-                start_time = int(time.time())
-                end_time = start_time + random.randint(1, 300)
-                action = random.choice(["ACCEPT", "REJECT"])
-                
-                # Create flow log entry
-                line = f"2 {account_id} {eni} {src_ip} {dst_ip} {src_port} {dst_port} " \
-                      f"{protocol} {packets} {bytes_count} {start_time} {end_time} {action} OK\n"
-                
-                f.write(line)
-                bytes_written += len(line.encode())
-                lines_written += 1
-                
-                if lines_written % 10000 == 0:
-                    print(f"Generated {lines_written} lines, {bytes_written/1024/1024:.2f}MB...")
-        
+                batch = self._generate_batch(batch_size)
+                f.write(batch)
+                bytes_written += len(batch)   # entries are pure ASCII
+                lines_written += batch_size
+                print(f"Generated {lines_written} lines, {bytes_written/1024/1024:.2f}MB...")
+
         final_size_mb = bytes_written/1024/1024
-        print(f"Flow log generated in {time.time() - start_time:.2f} seconds")
+        print(f"Flow log generated in {time.time() - wall_start:.2f} seconds")
         print(f"Final size: {final_size_mb:.2f}MB")
         print(f"Total lines: {lines_written}")
 
+    def _generate_batch(self, n: int) -> str:
+        """
+        Format n random flow log entries as one string.
+
+        Every random field is drawn for the whole batch up front with
+        random.choices, so the per-line work is a single f-string
+        instead of ~11 separate random calls plus a write.
+        """
+        choices = random.choices
+        alphabet = string.ascii_lowercase + string.digits
+        eni_chars = choices(alphabet, k=8 * n)
+        high = choices(range(1, 256), k=2 * n)       # leading IP octets
+        low = choices(range(256), k=6 * n)
+        src_ports = choices(self.all_ports, k=n)
+        dst_ports = choices(range(1024, 65536), k=n)
+        protocols = choices(self.protocols, k=n)
+        packets = choices(range(1, 1001), k=n)
+        byte_counts = choices(range(64, 1501), k=n)
+        durations = choices(range(1, 301), k=n)
+        actions = choices(("ACCEPT", "REJECT"), k=n)
+        now = int(time.time())
+        account_id = "123456789012"
+
+        lines = []
+        append = lines.append
+        for i in range(n):
+            h = 2 * i
+            o = 6 * i
+            e = 8 * i
+            append(
+                f"2 {account_id} eni-{''.join(eni_chars[e:e + 8])} "
+                f"{high[h]}.{low[o]}.{low[o + 1]}.{low[o + 2]} "
+                f"{high[h + 1]}.{low[o + 3]}.{low[o + 4]}.{low[o + 5]} "
+                f"{src_ports[i]} {dst_ports[i]} {protocols[i]} {packets[i]} "
+                f"{byte_counts[i]} {now} {now + durations[i]} {actions[i]} OK\n")
+        return "".join(lines)
+
 def main():
     generator = FlowLogGenerator()
     
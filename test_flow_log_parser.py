@@ -1,6 +1,8 @@
 import unittest
 import tempfile
+import shutil
 import os
+from collections import Counter
 from flow_log_parser import FlowLogAnalyzer
 
 class TestFlowLogAnalyzer(unittest.TestCase):
@@ -8,7 +10,12 @@ class TestFlowLogAnalyzer(unittest.TestCase):
         """Set up test files and environment before each test."""
 
         self.temp_dir = tempfile.mkdtemp()
-        
+
+        # Keep the on-disk lookup cache inside the temp dir so tests
+        # never touch (or get served from) the real user cache
+        self._old_cache_home = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = os.path.join(self.temp_dir, "cache")
+
 
         self.lookup_file = os.path.join(self.temp_dir, "test_lookup.csv")
         with open(self.lookup_file, "w") as f:
@@ -53,7 +60,12 @@ class TestFlowLogAnalyzer(unittest.TestCase):
         # Restore original protocol mappings file if it existed
         if os.path.exists("protocol_mappings.csv.bak"):
             os.rename("protocol_mappings.csv.bak", "protocol_mappings.csv")
-    
+
+        if self._old_cache_home is None:
+            os.environ.pop('XDG_CACHE_HOME', None)
+        else:
+            os.environ['XDG_CACHE_HOME'] = self._old_cache_home
+        shutil.rmtree(os.path.join(self.temp_dir, "cache"), ignore_errors=True)
         os.rmdir(self.temp_dir)
 
     ##TEST CASES
@@ -151,6 +163,98 @@ class TestFlowLogAnalyzer(unittest.TestCase):
             self.assertIn("Untagged,1", content)
             self.assertIn("Port/Protocol Combination Counts:", content)
 
+    #Test8 : Trusted mode must match strict results on well-formed logs
+    def test_trusted_mode_well_formed(self):
+        trusted = FlowLogAnalyzer(self.lookup_file, self.flow_log_file,
+                                  self.output_file, trusted=True)
+        self.assertEqual(trusted.analyze_logs(), self.analyzer.analyze_logs())
+
+    #Test9 : Trusted mode must not fabricate records when a chunk mixes
+    #        valid lines (including ones with extra numeric fields) and
+    #        irregular lines
+    def test_trusted_mode_mixed_input(self):
+        mixed_file = os.path.join(self.temp_dir, "mixed_flow.log")
+        with open(mixed_file, "w") as f:
+            # Valid line with extra trailing fields (baseline allows > 14)
+            f.write("2 123456789012 eni-0a1b2c3d 10.0.1.201 198.51.100.2 49153 443 6 25 20000 1620140761 1620140821 ACCEPT OK 77 66 0\n")
+            f.write("not a flow log line\n")
+            f.write("2 123456789012 eni-4d3c2b1a 192.168.1.100 203.0.113.101 49154 23 6 15 12000 1620140761 1620140821 REJECT OK\n")
+
+        trusted = FlowLogAnalyzer(self.lookup_file, mixed_file,
+                                  self.output_file, trusted=True)
+        try:
+            tag_counts, combo_counts = trusted.analyze_logs()
+        finally:
+            os.remove(mixed_file)
+
+        self.assertEqual(combo_counts, {(443, "tcp"): 1, (23, "tcp"): 1})
+        self.assertEqual(tag_counts, {"sv_P2": 1, "sv_P1": 1})
+
+    #Test10 : An empty flow log cannot be mmapped and must yield empty
+    #         results instead of raising
+    def test_empty_flow_log(self):
+        empty_file = os.path.join(self.temp_dir, "empty_flow.log")
+        open(empty_file, "w").close()
+        analyzer = FlowLogAnalyzer(self.lookup_file, empty_file, self.output_file)
+        try:
+            self.assertEqual(analyzer.analyze_logs(), ({}, {}))
+        finally:
+            os.remove(empty_file)
+
+    #Test11 : The chunked stream reader (fallback for files mmap cannot
+    #         handle, e.g. pipes) must count exactly like the mmap path
+    def test_stream_reader_matches_mmap(self):
+        tag_counts, combo_counts = Counter(), Counter()
+        with open(self.flow_log_file, "rb") as f:
+            self.analyzer._scan_stream(f, tag_counts, combo_counts)
+        self.assertEqual((dict(tag_counts), dict(combo_counts)),
+                         self.analyzer.analyze_logs())
+
+    #Test12 : The opt-in size cap must reject oversized files and leave
+    #         files under the cap alone
+    def test_max_size_cap(self):
+        capped = FlowLogAnalyzer(self.lookup_file, self.flow_log_file,
+                                 self.output_file, max_size_mb=0)
+        with self.assertRaises(Exception) as context:
+            capped.analyze_logs()
+        self.assertIn("maximum allowed size", str(context.exception))
+
+        roomy = FlowLogAnalyzer(self.lookup_file, self.flow_log_file,
+                                self.output_file, max_size_mb=10)
+        self.assertEqual(roomy.analyze_logs(), self.analyzer.analyze_logs())
+
+    #Test13 : A warm run must serve the lookup table from the on-disk
+    #         cache with identical mappings and results
+    def test_lookup_cache_warm_run(self):
+        cache_path = self.analyzer._lookup_cache_path()
+        self.assertTrue(os.path.exists(cache_path))
+        warm = FlowLogAnalyzer(self.lookup_file, self.flow_log_file,
+                               self.output_file)
+        self.assertEqual(warm.tag_mappings, self.analyzer.tag_mappings)
+        self.assertEqual(warm.analyze_logs(), self.analyzer.analyze_logs())
+
+    #Test14 : A corrupt cache file must be discarded and reparsed, not
+    #         crash every run until the user deletes it by hand
+    def test_lookup_cache_corrupt(self):
+        cache_path = self.analyzer._lookup_cache_path()
+        with open(cache_path, "wb") as f:
+            f.write(b"garbage\n")
+        recovered = FlowLogAnalyzer(self.lookup_file, self.flow_log_file,
+                                    self.output_file)
+        self.assertEqual(recovered.tag_mappings, self.analyzer.tag_mappings)
+        # The reparse rewrote a good cache; the next run is a clean hit
+        again = FlowLogAnalyzer(self.lookup_file, self.flow_log_file,
+                                self.output_file)
+        self.assertEqual(again.tag_mappings, self.analyzer.tag_mappings)
+
+    #Test15 : Editing the lookup file must invalidate the cache
+    def test_lookup_cache_invalidation(self):
+        with open(self.lookup_file, "w") as f:
+            f.write("dstport,protocol,tag\n")
+            f.write("8080,tcp,sv_P9\n")
+        edited = FlowLogAnalyzer(self.lookup_file, self.flow_log_file,
+                                 self.output_file)
+        self.assertEqual(edited.tag_mappings, {(8080, "tcp"): "sv_P9"})
 
 
 if __name__ == '__main__':